@@ -29,6 +29,11 @@ keystore_data = """{
 with open(fake_keystore, 'w') as f:
     f.write(keystore_data)
 
+# Test extensionless geth keystore (found by its UTC-- filename)
+fake_geth_keystore = test_dir / "UTC--2024-01-01T00-00-00.000Z--0123456789abcdef0123456789abcdef01234567"
+with open(fake_geth_keystore, 'w') as f:
+    f.write(keystore_data)
+
 # Test private key file
 fake_keys = test_dir / "private_keys.txt"
 keys_data = """5KJvsngHeMpm884wtkJvQa3EhhFmqzr7cPJjjLQj5vhYzUWjJmN
@@ -39,7 +44,7 @@ with open(fake_keys, 'w') as f:
 
 # Test seed phrase file
 fake_seed = test_dir / "seed_backup.txt"
-seed_data = "abandon ability able about above absent absolute absorb abstract absurd accept access"
+seed_data = "abandon ability able about above absent absorb abstract absurd abuse access accident"
 with open(fake_seed, 'w') as f:
     f.write(seed_data)
 
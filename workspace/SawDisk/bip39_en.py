@@ -0,0 +1,12 @@
+"""
+BIP39 English mnemonic wordlist for SawDisk
+"""
+from pathlib import Path
+
+WORDLIST_PATH = Path(__file__).with_name('bip39_english.txt')
+
+# The 2048 BIP39 words, loaded once at import
+WORDS = frozenset(WORDLIST_PATH.read_text().split())
+
+# Same words as bytes, for matching raw file content
+WORDS_BYTES = frozenset(word.encode('ascii') for word in WORDS)
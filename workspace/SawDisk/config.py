@@ -2,6 +2,7 @@
 Configuration management for SawDisk
 """
 import os
+import re
 from dataclasses import dataclass
 from typing import Optional
 
@@ -15,6 +16,8 @@ class Config:
     max_depth: int = 20
     num_threads: int = 4
     verbose: bool = False
+    use_processes: bool = False  # Analyze files in worker processes instead of threads
+    full_file_stats: bool = False  # Stat every file for size statistics, not just scan candidates
     
     # File size limits
     max_file_size: int = 100 * 1024 * 1024  # 100MB
@@ -54,4 +57,16 @@ class Config:
         r'^[KLNQ][1-9A-HJ-NP-Za-km-z]{49}$',  # Bitcoin WIF compressed
         r'^0x[a-fA-F0-9]{64}$',  # Ethereum private key
     ]
-
+    
+    def __post_init__(self):
+        # Flattened (wallet_type, pattern, lowercased pattern) triples in
+        # priority order, plus one alternation over every pattern so names
+        # that match nothing are rejected with a single regex search.
+        self.wallet_name_patterns = [
+            (wallet_type, pattern, pattern.lower())
+            for wallet_type, patterns in self.wallet_patterns.items()
+            for pattern in patterns
+        ]
+        self.wallet_filename_re = re.compile(
+            '|'.join(re.escape(lowered) for _, _, lowered in self.wallet_name_patterns)
+        )
@@ -1,49 +1,173 @@
 """
 Cryptocurrency detection logic for SawDisk
 """
+import os
 import re
-import json
+import mmap
+import codecs
 import base58
-import magic
+import orjson
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import binascii
 
 from models import ScanResult
 
+try:
+    import hyperscan
+except ImportError:  # Optional: signature search falls back to bytes.find
+    hyperscan = None
+from bip39_en import WORDS_BYTES as BIP39_WORDS
+
+# Files at or above this size are memory-mapped instead of read into RAM
+MMAP_THRESHOLD = 1024 * 1024  # 1MB
+
+# File content as handed to the detection checks
+Buffer = Union[bytes, mmap.mmap]
+
+# Wallet and key store formats that are always binary
+BINARY_EXTENSIONS = frozenset({
+    '.dat', '.wallet', '.walletdb', '.kdbx', '.db', '.sqlite', '.p12', '.pfx'
+})
+
+# Binary signatures in priority order: (signature, item_type, confidence, details)
+BINARY_SIGNATURES = (
+    (b'Bitcoin', 'bitcoin_core_wallet', 0.7,
+     {'detection_method': 'binary_signature', 'signature': 'Bitcoin'}),
+    (b'Electrum', 'electrum_wallet', 0.7,
+     {'detection_method': 'binary_signature', 'signature': 'Electrum'}),
+    (b'Ethereum', 'ethereum_wallet', 0.6,
+     {'detection_method': 'binary_signature', 'signature': 'Ethereum'}),
+    (b'Litecoin', 'litecoin_wallet', 0.7,
+     {'detection_method': 'binary_signature', 'signature': 'Litecoin'}),
+    # Bitcoin wallet.dat magic
+    (b'\xE6\xE1\xCF\xFA', 'bitcoin_core_wallet', 0.9,
+     {'detection_method': 'bitcoin_wallet_magic'}),
+)
+
+# Hyperscan database over BINARY_SIGNATURES, compiled on first use per process
+_hs_signature_db = None
+# Cleared after the first hyperscan failure so later files go straight to
+# the find loop instead of failing (and falling back) one by one
+_hs_enabled = hyperscan is not None
+# Hyperscan scratch space may not be shared between concurrent scans
+_hs_local = threading.local()
+
+# Bytes sniffed to classify files whose extension is not conclusive
+SNIFF_SIZE = 4096
+
 
 class CryptoDetector:
     """Detects cryptocurrency wallets and keys in files"""
     
     def __init__(self, config):
         self.config = config
+        self._text_extensions = frozenset(config.crypto_content_extensions)
+        
+        # Compile content patterns once per detector instead of per file.
+        # WIF and hex keys share one alternation so the content is walked once.
+        # Patterns are bytes-mode so they run directly on mmap buffers.
+        self._priv_key_combined = re.compile(
+            rb'(?m)^[^\S\n]*(?:'
+            rb'(?P<wif>[5KLNQ][1-9A-HJ-NP-Za-km-z]{50,51})'
+            rb'|(?P<eth>(?:0x)?[a-fA-F0-9]{64})'
+            rb')[^\S\n]*$'
+        )
+        
+        # A seed phrase is a run of at least 12 whitespace-separated words of
+        # 3-8 letters; only such runs are checked against the BIP39 wordlist
+        self._seed_run_re = re.compile(
+            rb'(?<!\S)(?:[A-Za-z]{3,8}\s+){11,}[A-Za-z]{3,8}(?!\S)'
+        )
+        
+        # Look for common wallet config patterns
+        config_patterns = [
+            ('bitcoin', rb'bitcoin.*:.*true'),
+            ('litecoin', rb'litecoin.*:.*true'),
+            ('database', rb'db.*=.*wallet'),
+            ('wallet', rb'wallet.*pass'),
+            ('electrum', rb'electrum.*:.*true'),
+            ('multibit', rb'multibit.*wallet')
+        ]
+        self._config_res = [
+            (wallet_type, re.compile(pattern, re.IGNORECASE))
+            for wallet_type, pattern in config_patterns
+        ]
+        
+        # Only JSON objects can be wallets; allows a UTF-8 BOM before the brace
+        self._json_object_re = re.compile(rb'(?:\xef\xbb\xbf)?\s*\{')
+        
+        # Every JSON wallet key and config pattern contains one of these
+        # literals, so a single pass can rule both checks out
+        self._content_hint_re = re.compile(
+            rb'crypto|wallet|bitcoin|litecoin|electrum', re.IGNORECASE
+        )
     
-    def analyze_file(self, file_path: str) -> Optional[ScanResult]:
-        """Analyze a file and return results if crypto content is found"""
+    def analyze_file(self, file_path: str, file_size: Optional[int] = None) -> Optional[ScanResult]:
+        """Analyze a file and return results if crypto content is found
         
-        file_path_obj = Path(file_path)
+        Args:
+            file_path: Path of the file to analyze
+            file_size: Size already known from the directory walk; looked up
+                       only for hits when omitted.
+        """
         
         # Check file type
         if self._is_binary_file(file_path):
             result = self._analyze_binary_file(file_path)
         else:
             result = self._analyze_text_file(file_path)
+        
+        if result is not None:
+            result.file_size = file_size if file_size is not None else os.path.getsize(file_path)
             
         return result
     
     def _is_binary_file(self, file_path: str) -> bool:
         """Check if file is binary"""
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in self._text_extensions:
+            return False
+        if ext in BINARY_EXTENSIONS:
+            return True
+        
+        # Unknown extension: sniff the first page
+        try:
+            with open(file_path, 'rb') as f:
+                chunk = f.read(SNIFF_SIZE)
+        except OSError:
+            return True
+        
+        if b'\0' in chunk:
+            return True
+        try:
+            # Incremental decode tolerates a character cut at the chunk end
+            codecs.getincrementaldecoder('utf-8')().decode(chunk, final=False)
+        except UnicodeDecodeError:
+            return True
+        return False
+    
+    @contextmanager
+    def _map_file(self, file_path: str):
+        """Yield file content as bytes, memory-mapping large files"""
+        # Raw fd: small files need one read() call and no buffered file object
+        fd = os.open(file_path, os.O_RDONLY)
         try:
-            mime_type = magic.from_file(file_path, mime=True)
-            return not mime_type.startswith('text/')
-        except:
-            # Fallback: read first few bytes
+            size = os.fstat(fd).st_size
+            if size < MMAP_THRESHOLD:
+                yield os.read(fd, size)
+                return
+            
+            # Let the OS page content in on demand instead of copying it
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
             try:
-                with open(file_path, 'rb') as f:
-                    chunk = f.read(1024)
-                    return b'\0' in chunk
-            except:
-                return True
+                yield mm
+            finally:
+                mm.close()
+        finally:
+            os.close(fd)
     
     def _analyze_binary_file(self, file_path: str) -> Optional[ScanResult]:
         """Analyze binary file for crypto patterns"""
@@ -56,8 +180,7 @@ class CryptoDetector:
             
         # Analyze file content for known crypto patterns
         try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
+            with self._map_file(file_path) as content:
                 return self._scan_binary_content(content, file_path)
         except Exception:
             return None
@@ -65,72 +188,85 @@ class CryptoDetector:
     def _analyze_text_file(self, file_path: str) -> Optional[ScanResult]:
         """Analyze text file for crypto patterns"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                return self._scan_text_content(content, file_path)
+            with self._map_file(file_path) as content:
+                result = self._scan_text_content(content, file_path)
         except Exception:
-            return None
+            result = None
+        
+        # Text files still get the filename check when their content shows
+        # nothing, e.g. an extensionless geth keystore (UTC--<time>--<address>)
+        if result is None:
+            result = self._check_filename_patterns(Path(file_path))
+        return result
     
     def _check_filename_patterns(self, file_path: Path) -> Optional[ScanResult]:
         """Check filename against known wallet patterns"""
         name = file_path.name.lower()
+        if not self.config.wallet_filename_re.search(name):
+            return None
         
-        for wallet_type, patterns in self.config.wallet_patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in name:
-                    return ScanResult(
-                        file_path=str(file_path),
-                        item_type=f"{wallet_type}_wallet_file",
-                        confidence=0.8,
-                        details={
-                            'detection_method': 'filename_pattern',
-                            'pattern_matched': pattern,
-                            'wallet_type': wallet_type
-                        }
-                    )
-        return None
+        # Resolve the match in list order so the first listed wallet type wins
+        wallet_type, pattern = next(
+            (wallet_type, pattern)
+            for wallet_type, pattern, lowered in self.config.wallet_name_patterns
+            if lowered in name
+        )
+        return ScanResult(
+            file_path=str(file_path),
+            item_type=f"{wallet_type}_wallet_file",
+            confidence=0.8,
+            details={
+                'detection_method': 'filename_pattern',
+                'pattern_matched': pattern,
+                'wallet_type': wallet_type
+            }
+        )
     
-    def _scan_binary_content(self, content: bytes, file_path: str) -> Optional[ScanResult]:
+    def _scan_binary_content(self, content: Buffer, file_path: str) -> Optional[ScanResult]:
         """Scan binary content for crypto patterns"""
         
-        # Look for common crypto signatures
-        signatures = {
-            b'Bitcoin': ('bitcoin_core_wallet', 0.7),
-            b'Electrum': ('electrum_wallet', 0.7),
-            b'Ethereum': ('ethereum_wallet', 0.6),
-            b'Litecoin': ('litecoin_wallet', 0.7),
-        }
-        
-        for signature, (type_name, confidence) in signatures.items():
-            if signature in content:
+        global _hs_enabled
+        if _hs_enabled:
+            try:
+                index = _hs_first_signature(content)
+            except Exception as e:
+                _hs_enabled = False
+                print(f"⚠️  Hyperscan signature scan failed, using find() from now on: {e}")
+                index = -1  # Fall through to the find loop below
+            else:
+                if index is None:
+                    return None
+                _, item_type, confidence, details = BINARY_SIGNATURES[index]
                 return ScanResult(
                     file_path=file_path,
-                    item_type=type_name,
+                    item_type=item_type,
                     confidence=confidence,
-                    details={
-                        'detection_method': 'binary_signature',
-                        'signature': signature.decode('utf-8', errors='ignore')
-                    }
+                    details=dict(details)
                 )
         
-        # Look for Bitcoin wallet.dat signature
-        if b'\xE6\xE1\xCF\xFA' in content:  # Bitcoin wallet.dat magic
-            return ScanResult(
-                file_path=file_path,
-                item_type='bitcoin_core_wallet',
-                confidence=0.9,
-                details={'detection_method': 'bitcoin_wallet_magic'}
-            )
+        # Each signature is a memchr-backed find; first entry found wins
+        for signature, item_type, confidence, details in BINARY_SIGNATURES:
+            if content.find(signature) != -1:
+                return ScanResult(
+                    file_path=file_path,
+                    item_type=item_type,
+                    confidence=confidence,
+                    details=dict(details)
+                )
         
         return None
     
-    def _scan_text_content(self, content: str, file_path: str) -> Optional[ScanResult]:
+    def _scan_text_content(self, content: Buffer, file_path: str) -> Optional[ScanResult]:
         """Scan text content for crypto patterns"""
         
+        # Cheap literal pre-check gating the JSON and config checks
+        has_hint = self._content_hint_re.search(content) is not None
+        
         # Check for JSON wallet files
-        json_result = self._check_json_wallet(content, file_path)
-        if json_result:
-            return json_result
+        if has_hint:
+            json_result = self._check_json_wallet(content, file_path)
+            if json_result:
+                return json_result
         
         # Check for private keys
         key_result = self._check_private_keys(content, file_path)
@@ -143,16 +279,23 @@ class CryptoDetector:
             return seed_result
         
         # Check for wallet configs
-        config_result = self._check_wallet_configs(content, file_path)
-        if config_result:
-            return config_result
+        if has_hint:
+            config_result = self._check_wallet_configs(content, file_path)
+            if config_result:
+                return config_result
         
         return None
     
-    def _check_json_wallet(self, content: str, file_path: str) -> Optional[ScanResult]:
+    def _check_json_wallet(self, content: Buffer, file_path: str) -> Optional[ScanResult]:
         """Check if content is a JSON wallet file"""
+        start = self._json_object_re.match(content)
+        if start is None:
+            return None
+        
         try:
-            data = json.loads(content)
+            # orjson parses the buffer in place, including mmaps
+            with memoryview(content) as view:
+                data = orjson.loads(view[start.end() - 1:])
             
             # Common wallet JSON structures
             if isinstance(data, dict):
@@ -183,17 +326,21 @@ class CryptoDetector:
                         details={'detection_method': 'exodus_json'}
                     )
                     
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
+            # Not JSON, or not valid UTF-8
             pass
         
         return None
     
-    def _check_private_keys(self, content: str, file_path: str) -> Optional[ScanResult]:
+    def _check_private_keys(self, content: Buffer, file_path: str) -> Optional[ScanResult]:
         """Check for private key patterns"""
         
+        match = self._priv_key_combined.search(content)
+        if match is None:
+            return None
+        
         # Bitcoin WIF private key
-        wif_pattern = r'^[5KLNQ][123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz]{50,51}$'
-        if re.search(wif_pattern, content.strip(), re.MULTILINE):
+        if match.lastgroup == 'wif':
             return ScanResult(
                 file_path=file_path,
                 item_type='bitcoin_private_key',
@@ -201,79 +348,101 @@ class CryptoDetector:
                 details={'detection_method': 'wif_pattern'}
             )
         
-        # Ethereum private key (64 hex chars)
-        eth_pattern = r'^(0x)?[a-fA-F0-9]{64}$'
-        lines = content.strip().split('\n')
-        for line in lines:
-            line = line.strip()
-            if re.match(eth_pattern, line):
-                return ScanResult(
-                    file_path=file_path,
-                    item_type='ethereum_private_key',
-                    confidence=0.7,
-                    details={'detection_method': 'eth_hex_pattern'}
-                )
-        
-        # Generic hex private key
-        hex_pattern = r'^[a-fA-F0-9]{64}$'
-        for line in lines:
-            if re.match(hex_pattern, line.strip()) and len(line.strip()) == 64:
-                return ScanResult(
-                    file_path=file_path,
-                    item_type='generic_private_key',
-                    confidence=0.5,
-                    details={'detection_method': 'hex_64_pattern'}
-                )
-        
-        return None
+        # Ethereum private key (64 hex chars, optional 0x prefix)
+        return ScanResult(
+            file_path=file_path,
+            item_type='ethereum_private_key',
+            confidence=0.7,
+            details={'detection_method': 'eth_hex_pattern'}
+        )
     
-    def _check_seed_phrases(self, content: str, file_path: str) -> Optional[ScanResult]:
+    def _check_seed_phrases(self, content: Buffer, file_path: str) -> Optional[ScanResult]:
         """Check for mnemonic seed phrases"""
         
-        # Common BIP39 seed phrase pattern
-        words = content.strip().split()
-        if 12 <= len(words) <= 24:
-            # Check if words look like BIP39 words (simplified check)
-            bip39_words = {
-                'abandon', 'ability', 'able', 'about', 'above', 'absent', 'absolute',
-                'absorb', 'abstract', 'absurd', 'accept', 'access', 'accident',
-                'account', 'accuse', 'achieve', 'acid', 'acoustic', 'acquire',
-                'action', 'actor', 'actual', 'adapt', 'addiction', 'address'
-            }
+        for match in self._seed_run_re.finditer(content):
+            # Longest streak of consecutive BIP39 words in this run
+            longest = streak = 0
+            for word in match.group().split():
+                if word.lower() in BIP39_WORDS:
+                    streak += 1
+                    longest = max(longest, streak)
+                else:
+                    streak = 0
             
-            if any(word.lower() in bip39_words for word in words[:5]):
+            if longest >= 12:
                 return ScanResult(
                     file_path=file_path,
                     item_type='bip39_seed_phrase',
                     confidence=0.6,
                     details={
                         'detection_method': 'bip39_word_check',
-                        'word_count': len(words)
+                        'word_count': longest
                     }
                 )
         
         return None
     
-    def _check_wallet_configs(self, content: str, file_path: str) -> Optional[ScanResult]:
+    def _check_wallet_configs(self, content: Buffer, file_path: str) -> Optional[ScanResult]:
         """Check for wallet configuration files"""
         
-        # Look for common wallet config patterns
-        config_patterns = [
-             ('bitcoin', r'bitcoin.*:.*true'),
-             ('litecoin', r'litecoin.*:.*true'),
-             ('database', r'db.*=.*wallet'),
-             ('wallet', r'wallet.*pass'),
-             ('electrum', r'electrum.*:.*true'),
-             ('multibit', r'multibit.*wallet')
-         ]
-        
-        for wallet_type, pattern in config_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
+        for wallet_type, pattern in self._config_res:
+            if pattern.search(content):
                 return ScanResult(
                     file_path=file_path,
                     item_type=f'{wallet_type}_config',
                     confidence=0.5,
-                    details={'detection_method': 'config_pattern', 'pattern': pattern}
+                    details={'detection_method': 'config_pattern', 'pattern': pattern.pattern.decode()}
                 )
         
         return None
+
+
+def _hs_first_signature(content: Buffer) -> Optional[int]:
+    """Return the index of the highest-priority signature in content, or None"""
+    global _hs_signature_db
+    db = _hs_signature_db
+    if db is None:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[b''.join(b'\\x%02x' % byte for byte in signature)
+                         for signature, *_ in BINARY_SIGNATURES],
+            ids=list(range(len(BINARY_SIGNATURES))),
+            elements=len(BINARY_SIGNATURES),
+            flags=hyperscan.HS_FLAG_SINGLEMATCH
+        )
+        _hs_signature_db = db
+    
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(db)
+    
+    # One pass over the buffer reports each signature present at most once
+    found = []
+    db.scan(content, match_event_handler=lambda sig_id, *_: found.append(sig_id),
+            scratch=scratch)
+    return min(found) if found else None
+
+
+# Detector owned by the current process pool worker
+_worker_detector: Optional[CryptoDetector] = None
+
+
+def init_worker(config) -> None:
+    """Process pool initializer: build this worker's detector once"""
+    global _worker_detector
+    _worker_detector = CryptoDetector(config)
+
+
+def analyze_one(file_path: str, file_size: Optional[int] = None) -> Optional[ScanResult]:
+    """Process pool task: analyze a single file with the worker's detector"""
+    try:
+        return _worker_detector.analyze_file(file_path, file_size)
+    except Exception as e:
+        if _worker_detector.config.verbose:
+            print(f"⚠️  Error scanning {file_path}: {e}")
+        return None
+
+
+def analyze_batch(files: List[Tuple[str, int]]) -> List[Optional[ScanResult]]:
+    """Process pool task: analyze a batch of (file_path, file_size) pairs"""
+    return [analyze_one(file_path, file_size) for file_path, file_size in files]
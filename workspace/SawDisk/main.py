@@ -44,7 +44,13 @@ init()
 @click.option('--verbose', '-v',
               is_flag=True,
               help='Verbose output')
-def main(scan_path, output_dir, report_format, depth, threads, verbose):
+@click.option('--processes',
+              is_flag=True,
+              help='Analyze files in worker processes instead of threads')
+@click.option('--full-stats', 'full_stats',
+              is_flag=True,
+              help='Size every file for the statistics, not just scan candidates')
+def main(scan_path, output_dir, report_format, depth, threads, verbose, processes, full_stats):
     """
     SawDisk - A cryptographic wallet and key scanner.
     
@@ -70,7 +76,9 @@ def main(scan_path, output_dir, report_format, depth, threads, verbose):
         report_format=report_format,
         max_depth=depth,
         num_threads=threads,
-        verbose=verbose
+        verbose=verbose,
+        use_processes=processes,
+        full_file_stats=full_stats
     )
     
     try:
@@ -2,20 +2,31 @@
 Data models for SawDisk
 """
 import time
-import os
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
 
 
+# Scans can produce many results; slots avoid a per-instance __dict__
+@dataclass(slots=True)
 class ScanResult:
     """Represents a detected crypto-related item"""
+    file_path: str
+    item_type: str  # wallet, private_key, seed_phrase, etc.
+    confidence: float
+    details: Optional[Dict[str, Any]] = None
+    file_size: int = 0
+    scan_time: float = field(default_factory=time.time)
     
-    def __init__(self, file_path: str, item_type: str, confidence: float, 
-                 details: Dict[str, Any] = None):
-        self.file_path = file_path
-        self.item_type = item_type  # wallet, private_key, seed_phrase, etc.
-        self.confidence = confidence
-        self.details = details or {}
-        self.scan_time = time.time()
-        self.file_size = 0
-        if os.path.exists(file_path):
-            self.file_size = os.path.getsize(file_path)
+    def __post_init__(self):
+        self.details = self.details or {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form used for JSON output and status payloads"""
+        return {
+            'file_path': self.file_path,
+            'item_type': self.item_type,
+            'confidence': self.confidence,
+            'file_size': self.file_size,
+            'scan_time': self.scan_time,
+            'details': self.details
+        }
@@ -1,42 +1,24 @@
 """
 Report generation for SawDisk
 """
-import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List
-from jinja2 import Template
+from typing import Dict, List, Tuple
+import orjson
+from jinja2 import Environment
 
 from models import ScanResult
 from config import Config
 
+# Units for _format_size, one per power of 1024
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
-class ReportGenerator:
-    """Generates reports from scan results"""
-    
-    def __init__(self, config: Config):
-        self.config = config
-    
-    def generate_report(self, results: List[ScanResult]) -> str:
-        """Generate report based on results and format"""
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_name = f"sawdisk_report_{timestamp}"
-        
-        if self.config.report_format == 'html':
-            return self._generate_html_report(results, report_name)
-        elif self.config.report_format == 'json':
-            return self._generate_json_report(results, report_name)
-        elif self.config.report_format == 'markdown':
-            return self._generate_markdown_report(results, report_name)
-        else:
-            raise ValueError(f"Unsupported report format: {self.config.report_format}")
-    
-    def _generate_html_report(self, results: List[ScanResult], report_name: str) -> str:
-        """Generate HTML report"""
-        
-        html_template = """
+# Markdown heading label per confidence bucket
+MARKDOWN_CONFIDENCE_LABELS = {'high': "🔴 High", 'medium': "🟡 Medium", 'low': "🟢 Low"}
+
+# HTML report layout, compiled once into HTML_TEMPLATE at the bottom of this module
+HTML_TEMPLATE_SOURCE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -104,57 +86,81 @@ class ReportGenerator:
     </div>
 </body>
 </html>
-        """
+"""
+
+
+class ReportGenerator:
+    """Generates reports from scan results"""
+    
+    def __init__(self, config: Config):
+        self.config = config
+    
+    def generate_report(self, results: List[ScanResult]) -> str:
+        """Generate report based on results and format"""
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_name = f"sawdisk_report_{timestamp}"
+        
+        if self.config.report_format == 'html':
+            return self._generate_html_report(results, report_name)
+        elif self.config.report_format == 'json':
+            return self._generate_json_report(results, report_name)
+        elif self.config.report_format == 'markdown':
+            return self._generate_markdown_report(results, report_name)
+        else:
+            raise ValueError(f"Unsupported report format: {self.config.report_format}")
+    
+    def _generate_html_report(self, results: List[ScanResult], report_name: str) -> str:
+        """Generate HTML report"""
         
-        template = Template(html_template)
-        html_content = template.render(
+        counts, _ = self._confidence_buckets(results)
+        stream = HTML_TEMPLATE.stream(
             timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             scan_path=self.config.scan_path,
             total_items=len(results),
             results=results,
-            high_conf_count=len([r for r in results if r.confidence >= 0.7]),
-            medium_conf_count=len([r for r in results if 0.7 > r.confidence >= 0.5]),
-            low_conf_count=len([r for r in results if r.confidence < 0.5]),
-            format_size=self._format_size,
-            datetime=lambda x: datetime.fromtimestamp(x).strftime("%Y-%m-%d %H:%M:%S")
+            high_conf_count=counts['high'],
+            medium_conf_count=counts['medium'],
+            low_conf_count=counts['low']
         )
         
+        # Write the report as it renders instead of building it in memory
         report_path = Path(self.config.output_dir) / f"{report_name}.html"
-        report_path.write_text(html_content)
+        with open(report_path, 'w') as f:
+            stream.dump(f)
         
         return str(report_path)
     
     def _generate_json_report(self, results: List[ScanResult], report_name: str) -> str:
         """Generate JSON report"""
         
-        report_data = {
-            'report_info': {
-                'generated_at': datetime.now().isoformat(),
-                'scan_path': self.config.scan_path,
-                'total_items': len(results)
-            },
-            'results': [
-                {
-                    'file_path': result.file_path,
-                    'item_type': result.item_type,
-                    'confidence': result.confidence,
-                    'file_size': result.file_size,
-                    'scan_time': result.scan_time,
-                    'details': result.details
-                }
-                for result in results
-            ]
+        report_info = {
+            'generated_at': datetime.now().isoformat(),
+            'scan_path': self.config.scan_path,
+            'total_items': len(results)
         }
         
+        # Stream one result at a time rather than serializing the whole
+        # report in memory; the bytes match OPT_INDENT_2 on the full dict.
         report_path = Path(self.config.output_dir) / f"{report_name}.json"
-        report_path.write_text(json.dumps(report_data, indent=2))
+        with open(report_path, 'wb') as f:
+            f.write(b'{\n  "report_info": ')
+            f.write(_indent_json(report_info, b'  '))
+            f.write(b',\n  "results": [')
+            separator = b'\n    '
+            for result in results:
+                f.write(separator)
+                f.write(_indent_json(result.to_dict(), b'    '))
+                separator = b',\n    '
+            f.write(b'\n  ]\n}' if results else b']\n}')
         
         return str(report_path)
     
     def _generate_markdown_report(self, results: List[ScanResult], report_name: str) -> str:
         """Generate Markdown report"""
         
-        md_content = f"""# 🔍 SawDisk Crypto Scanner Report
+        counts, buckets = self._confidence_buckets(results)
+        parts = [f"""# 🔍 SawDisk Crypto Scanner Report
 
 **Generated:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}  
 **Scan Path:** {self.config.scan_path}
@@ -162,49 +168,83 @@ class ReportGenerator:
 ## 📊 Summary
 
 - **Total Items Found:** {len(results)}
-- **High Confidence (≥70%):** {len([r for r in results if r.confidence >= 0.7])}
-- **Medium Confidence (50-69%):** {len([r for r in results if 0.7 > r.confidence >= 0.5])}
-- **Low Confidence (<50%):** {len([r for r in results if r.confidence < 0.5])}
+- **High Confidence (≥70%):** {counts['high']}
+- **Medium Confidence (50-69%):** {counts['medium']}
+- **Low Confidence (<50%):** {counts['low']}
 
 ## 🔍 Findings
 
-"""
+"""]
         
-        for i, result in enumerate(results, 1):
-            confidence_label = "🔴 High" if result.confidence >= 0.7 else "🟡 Medium" if result.confidence >= 0.5 else "🟢 Low"
+        for i, (result, bucket) in enumerate(zip(results, buckets), 1):
+            confidence_label = MARKDOWN_CONFIDENCE_LABELS[bucket]
             
-            md_content += f"""### {i}. {result.item_type} {confidence_label}
+            parts.append(f"""### {i}. {result.item_type} {confidence_label}
 
 **Path:** `{result.file_path}`  
 **Confidence:** {result.confidence * 100:.1f}%  
 **File Size:** {self._format_size(result.file_size)}  
 **Type:** {result.item_type}  
 
-"""
+""")
             
             if result.details:
-                md_content += "**Details:**\n"
+                parts.append("**Details:**\n")
                 for key, value in result.details.items():
-                    md_content += f"- {key}: {value}\n"
-                md_content += "\n"
+                    parts.append(f"- {key}: {value}\n")
+                parts.append("\n")
             
-            md_content += "---\n\n"
+            parts.append("---\n\n")
         
-        md_content += """
+        parts.append("""
 ## ⚠️ Disclaimer
 
 This report is generated for forensic and security purposes only. Handle sensitive information with extreme care and follow applicable laws.
-"""
+""")
         
         report_path = Path(self.config.output_dir) / f"{report_name}.md"
-        report_path.write_text(md_content)
+        report_path.write_text(''.join(parts))
         
         return str(report_path)
     
-    def _format_size(self, size_bytes: int) -> str:
+    @staticmethod
+    def _confidence_buckets(results: List[ScanResult]) -> Tuple[Dict[str, int], List[str]]:
+        """Tally results per confidence bucket in one pass, also returning each result's bucket"""
+        counts = {'high': 0, 'medium': 0, 'low': 0}
+        buckets = []
+        for result in results:
+            if result.confidence >= 0.7:
+                bucket = 'high'
+            elif result.confidence >= 0.5:
+                bucket = 'medium'
+            else:
+                bucket = 'low'
+            counts[bucket] += 1
+            buckets.append(bucket)
+        return counts, buckets
+    
+    @staticmethod
+    def _format_size(size_bytes: int) -> str:
         """Format file size in human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} TB"
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f} B"
+        # Every 10 bits is one 1024x unit step
+        idx = min((int(size_bytes).bit_length() - 1) // 10, 4)
+        return f"{size_bytes / (1 << (idx * 10)):.1f} {SIZE_UNITS[idx]}"
+
+
+def _indent_json(value, indent: bytes) -> bytes:
+    """orjson-encode value with 2-space indentation nested under indent"""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n' + indent)
+
+
+def _format_timestamp(timestamp: float) -> str:
+    """Format a scan timestamp for the HTML report"""
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Compile the HTML template once per process rather than once per report
+_html_env = Environment(auto_reload=False)
+_html_env.filters['format_size'] = ReportGenerator._format_size
+_html_env.filters['datetime'] = _format_timestamp
+HTML_TEMPLATE = _html_env.from_string(HTML_TEMPLATE_SOURCE)
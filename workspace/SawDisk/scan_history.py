@@ -5,13 +5,15 @@ Handles storage and retrieval of individual scan reports
 
 import json
 import os
+import threading
+import orjson
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanRecord:
     """Individual scan record"""
     scan_id: str
@@ -33,7 +35,24 @@ class ScanHistoryManager:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.history_file = self.data_dir / "scan_history.json"
+        # Append-only log of saves since the history file was last compacted
+        self.log_file = self.data_dir / "scan_history.log"
+        # Bumped on every change so callers can tell when cached views are stale
+        self.version = 0
+        # (version, get_all_scans() result), rebuilt after the next change
+        self._sorted_scans = None
+        # scan_id -> (version, encoded record) for get_scan_json, cleared on
+        # every change
+        self._json_cache = {}
         self._load_history()
+        
+        # Scan threads append to the log while request threads may compact
+        # it; one lock keeps records, log lines and truncation in step
+        self._log_lock = threading.Lock()
+        self._log = open(self.log_file, 'a')
+        if self._log.tell() > 0:
+            # Fold records logged by a previous run into the history file
+            self._save_history()
     
     def _load_history(self):
         """Load scan history from disk"""
@@ -47,28 +66,91 @@ class ScanHistoryManager:
         except Exception as e:
             print(f"⚠️  Error loading scan history: {e}")
             self.scans = {}
+        
+        # Replay saves logged after the history file was written
+        if self.log_file.exists():
+            with open(self.log_file, 'r') as f:
+                for line in f:
+                    try:
+                        scan = json.loads(line)
+                        self.scans[scan['scan_id']] = ScanRecord(**scan)
+                    except Exception:
+                        # Skip a line cut short by a crash mid-write
+                        continue
     
     def save_scan(self, scan_record: ScanRecord):
         """Save a scan record"""
-        self.scans[scan_record.scan_id] = scan_record
-        self._save_history()
+        with self._log_lock:
+            self.scans[scan_record.scan_id] = scan_record
+            self._changed()
+            try:
+                # Append just this record instead of rewriting the whole history
+                self._log.write(json.dumps(asdict(scan_record)) + '\n')
+                self._log.flush()
+            except Exception as e:
+                print(f"⚠️  Error saving scan history: {e}")
     
     def _save_history(self):
-        """Write scan history to disk"""
-        try:
-            data = {'scans': [asdict(scan) for scan in self.scans.values()]}
-            with open(self.history_file, 'w') as f:
-                json.dump(data, f, indent=2, sort_keys=True)
-        except Exception as e:
-            print(f"⚠️  Error saving scan history: {e}")
+        """Write the compact scan history to disk and clear the log"""
+        with self._log_lock:
+            try:
+                data = {'scans': [asdict(scan) for scan in self.scans.values()]}
+                with open(self.history_file, 'w') as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                self._log.seek(0)
+                self._log.truncate()
+            except Exception as e:
+                print(f"⚠️  Error saving scan history: {e}")
+    
+    def close(self):
+        """Compact the history and close the log"""
+        if self._log.closed:
+            return
+        self._save_history()
+        with self._log_lock:
+            self._log.close()
     
     def get_scan(self, scan_id: str) -> Optional[ScanRecord]:
         """Get specific scan record"""
         return self.scans.get(scan_id)
     
+    def _changed(self):
+        """Invalidate cached views of the history"""
+        self.version += 1
+        self._sorted_scans = None
+        self._json_cache.clear()
+    
+    def get_scan_json(self, scan_id: str) -> Optional[bytes]:
+        """Get specific scan record as JSON, encoded once until the history changes"""
+        version = self.version
+        cached = self._json_cache.get(scan_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        scan_record = self.scans.get(scan_id)
+        if scan_record is None:
+            return None
+        data = orjson.dumps(scan_record)
+        # Records are updated in place before save_scan; an encoding made
+        # while that happened is returned but not kept
+        if self.version == version:
+            self._json_cache[scan_id] = (version, data)
+        return data
+    
     def get_all_scans(self) -> List[ScanRecord]:
         """Get all scan records, sorted by timestamp (newest first)"""
-        return sorted(self.scans.values(), key=lambda x: x.timestamp, reverse=True)
+        # Re-sorted only after a save or cleanup; callers must not modify the list
+        cached = self._sorted_scans
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        
+        # Tag the list with the version read before sorting, so a save that
+        # lands mid-sort leaves it stale instead of passing it off as current
+        version = self.version
+        scans = sorted(self.scans.values(), key=lambda x: x.timestamp, reverse=True)
+        if self.version == version:
+            self._sorted_scans = (version, scans)
+        return scans
     
     def get_scans_for_drive(self, drive_path: str) -> List[ScanRecord]:
         """Get all scans for a specific drive"""
@@ -93,7 +175,10 @@ class ScanHistoryManager:
                     shutil.rmtree(scan_dir)
                 
                 # Remove from history
-                del self.scans[scan.scan_id]
+                with self._log_lock:
+                    del self.scans[scan.scan_id]
             
+            with self._log_lock:
+                self._changed()
             self._save_history()
             print(f"🧹 Cleaned up {len(scans_to_remove)} old scans")
@@ -3,6 +3,7 @@ Scan Manager for SawDisk
 Handles exclusive scan execution and real-time state management
 """
 
+import queue
 import threading
 import time
 import uuid
@@ -15,6 +16,10 @@ from config import Config
 from scan_history import ScanHistoryManager, ScanRecord
 
 
+# Pending updates kept per status subscriber before new ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
 @dataclass
 class ScanSession:
     """Active scan session"""
@@ -26,6 +31,17 @@ class ScanSession:
     status: str  # 'running', 'stopping', 'stopped', 'completed', 'error'
     stop_requested: bool = False
     results: list = None
+    # Derived from config.scan_path once so status polls don't rebuild them
+    scan_path_str: str = ''
+    drive_name: str = ''
+    report_path: str = ''
+    # Set when the scan thread finishes, so finished status stays identical
+    end_time: float = 0.0
+
+
+def _serialize_results(results: Optional[list]) -> list:
+    """JSON-ready dicts for a session's ScanResult list"""
+    return [result.to_dict() for result in results or ()]
 
 
 class ScanManager:
@@ -48,19 +64,43 @@ class ScanManager:
             self.session_lock = threading.RLock()
             self.scan_history = ScanHistoryManager()
             self._status_callbacks = []
+            # Queues of connected status streams, fed by _notify_status
+            self._subscribers = set()
             self._initialized = True
     
     def add_status_callback(self, callback):
         """Add callback function to receive status updates"""
         self._status_callbacks.append(callback)
     
+    def subscribe(self) -> queue.Queue:
+        """Register a queue that receives every status update"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self.session_lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: queue.Queue):
+        """Stop sending status updates to a subscribed queue"""
+        with self.session_lock:
+            self._subscribers.discard(subscriber)
+    
     def _notify_status(self, update: Dict[str, Any]):
-        """Notify all registered callbacks about status changes"""
+        """Notify all registered callbacks and subscribers about status changes"""
         for callback in self._status_callbacks:
             try:
                 callback(update)
             except Exception as e:
                 print(f"Error in status callback: {e}")
+        
+        with self.session_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(update)
+            except queue.Full:
+                # A stalled client only misses wake-ups; it still gets the
+                # next periodic status
+                pass
     
     def is_scan_running(self) -> bool:
         """Check if a scan is currently running"""
@@ -85,8 +125,11 @@ class ScanManager:
             config = Config(**config_dict)
             
             # Create scanner
-            scanner = DiskScanner(config)
-            scanner.scan_id = scan_id
+            scanner = DiskScanner(config, scan_id=scan_id)
+            
+            scan_path_str = str(config.scan_path)
+            scan_path_obj = Path(config.scan_path) if not isinstance(config.scan_path, Path) else config.scan_path
+            drive_name = scan_path_obj.name if hasattr(scan_path_obj, 'name') else Path(scan_path_str).name
             
             # Create scan session
             self.current_session = ScanSession(
@@ -96,7 +139,9 @@ class ScanManager:
                 config=config,
                 start_time=time.time(),
                 status='running',
-                results=[]
+                results=[],
+                scan_path_str=scan_path_str,
+                drive_name=drive_name
             )
             
             # Start scan thread
@@ -107,12 +152,10 @@ class ScanManager:
             self.current_session.thread.start()
             
             # Create scan record
-            scan_path_str = str(config.scan_path)
-            scan_path_obj = Path(config.scan_path) if not isinstance(config.scan_path, Path) else config.scan_path
             scan_record = ScanRecord(
                 scan_id=scan_id,
                 timestamp=datetime.now().isoformat(),
-                drive_name=scan_path_obj.name if hasattr(scan_path_obj, 'name') else Path(scan_path_str).name,
+                drive_name=drive_name,
                 scan_path=scan_path_str,
                 files_found=0,
                 total_files_scanned=0,
@@ -162,74 +205,91 @@ class ScanManager:
     def get_current_status(self) -> Dict[str, Any]:
         """Get current scan status with real-time info"""
         with self.session_lock:
-            if not self.current_session:
-                return {
-                    'status': 'idle',
-                    'is_running': False,
-                    'message': 'No scan running'
-                }
-            
             session = self.current_session
-            if session.status == 'running':
-                try:
-                    progress = session.scanner.get_progress_info()
-                    scan_path_str = str(session.config.scan_path)
-                    scan_path_obj = Path(session.config.scan_path) if not isinstance(session.config.scan_path, Path) else session.config.scan_path
-                    drive_name = scan_path_obj.name if hasattr(scan_path_obj, 'name') else Path(scan_path_str).name
-                    
-                    # Get scan stats and convert sets to lists for JSON serialization
-                    scan_stats = session.scanner.scan_progress.get('scan_stats', {}).copy()
-                    if 'extensions_found' in scan_stats and isinstance(scan_stats['extensions_found'], set):
-                        scan_stats['extensions_found'] = list(scan_stats['extensions_found'])
-                    if 'directories_scanned' in scan_stats and isinstance(scan_stats['directories_scanned'], list):
-                        # Limit directories list size to avoid huge JSON
-                        scan_stats['directories_scanned'] = scan_stats['directories_scanned'][-100:]
-                    
-                    return {
-                        'status': 'running',
-                        'is_running': True,
-                        'scan_id': session.scan_id,
-                        'drive': drive_name,
-                        'scan_path': scan_path_str,
-                        'progress': progress.get('progress_percent', 0),
-                        'current_file': progress.get('current_file', ''),
-                        'current_directory': progress.get('current_directory', ''),
-                        'files_scanned': progress.get('files_scanned', 0),
-                        'files_found': progress.get('files_found', 0),
-                        'estimated_total_files': progress.get('estimated_total_files', 0),
-                        'elapsed_time': progress.get('elapsed_time', 0),
-                        'files_per_second': progress.get('files_per_second', 0),
-                        'eta_seconds': progress.get('eta_seconds', 0),
-                        'start_time': session.start_time,
-                        'scan_stats': scan_stats,
-                        'results': session.results or [],
-                        'stop_requested': session.stop_requested
-                    }
-                except Exception as e:
-                    print(f"Error getting progress: {e}")
-                    return {
-                        'status': 'running',
-                        'is_running': True,
-                        'scan_id': session.scan_id,
-                        'error': str(e)
-                    }
-            
-            elif session.status == 'stopping':
+        
+        if session is None:
+            return {
+                'status': 'idle',
+                'is_running': False,
+                'message': 'No scan running'
+            }
+        
+        # Progress is read from the scanner's own state, outside session_lock,
+        # so a slow status poll can't hold up start/stop or scan completion
+        status = session.status
+        if status == 'running':
+            try:
+                progress = session.scanner.get_progress_info()
+                # get_progress_info already hands back its own copy of the stats
+                scan_stats = progress.get('scan_stats', {})
+                
                 return {
-                    'status': 'stopping',
+                    'status': 'running',
                     'is_running': True,
                     'scan_id': session.scan_id,
-                    'message': 'Stopping scan...'
+                    'drive': session.drive_name,
+                    'scan_path': session.scan_path_str,
+                    'progress': progress.get('progress_percent', 0),
+                    'current_file': progress.get('current_file', ''),
+                    'current_directory': progress.get('current_directory', ''),
+                    'files_scanned': progress.get('files_scanned', 0),
+                    'files_found': progress.get('files_found', 0),
+                    'estimated_total_files': progress.get('estimated_total_files', 0),
+                    'collection_complete': progress.get('collection_complete', False),
+                    'elapsed_time': progress.get('elapsed_time', 0),
+                    'files_per_second': progress.get('files_per_second', 0),
+                    'eta_seconds': progress.get('eta_seconds', 0),
+                    'start_time': session.start_time,
+                    'scan_stats': scan_stats,
+                    'results': _serialize_results(session.results),
+                    'stop_requested': session.stop_requested
                 }
-            
-            else:
+            except Exception as e:
+                print(f"Error getting progress: {e}")
                 return {
-                    'status': session.status,
-                    'is_running': False,
+                    'status': 'running',
+                    'is_running': True,
                     'scan_id': session.scan_id,
-                    'results': session.results or [],
-                    'scan_duration': time.time() - session.start_time
+                    'error': str(e)
                 }
+        
+        elif status == 'stopping':
+            return {
+                'status': 'stopping',
+                'is_running': True,
+                'scan_id': session.scan_id,
+                'message': 'Stopping scan...'
+            }
+        
+        else:
+            return {
+                'status': status,
+                'is_running': False,
+                'scan_id': session.scan_id,
+                'results': _serialize_results(session.results),
+                'scan_duration': (session.end_time or time.time()) - session.start_time
+            }
+    
+    def get_results(self) -> Dict[str, Any]:
+        """Get results of the current (or most recent) scan"""
+        with self.session_lock:
+            session = self.current_session
+        
+        if session is None:
+            return {
+                'results': [],
+                'total_found': 0,
+                'scan_time': None,
+                'report_path': ''
+            }
+        
+        results = _serialize_results(session.results)
+        return {
+            'results': results,
+            'total_found': len(results),
+            'scan_time': session.start_time,
+            'report_path': session.report_path
+        }
     
     def _run_scan_thread(self):
         """Thread function to run the scan"""
@@ -245,8 +305,9 @@ class ScanManager:
             session.scanner.config.output_dir = str(scan_dir)
             results = session.scanner.scan()
             
-            # Update session with results
-            session.results = [result.__dict__ for result in results]
+            # Keep the ScanResult objects; they are serialized only when a
+            # status request asks for them
+            session.results = results
             
             # Generate reports if scan completed successfully
             if not session.stop_requested:
@@ -254,6 +315,7 @@ class ScanManager:
                 reporter = ReportGenerator(session.config)
                 if session.results:
                     report_path = reporter.generate_report(results)
+                    session.report_path = report_path or ''
                     
                     # Calculate drive size
                     drive_size = "Unknown"
@@ -313,6 +375,7 @@ class ScanManager:
                 self.scan_history.save_scan(scan_record)
         
         finally:
+            session.end_time = time.time()
             # Don't clear session immediately - keep it for status queries
             # Session will be cleared when a new scan starts
             print(f"Scan thread finished for: {session.scan_id}")
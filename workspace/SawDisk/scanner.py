@@ -6,22 +6,66 @@ import re
 import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from tqdm import tqdm
 
 from config import Config
 from models import ScanResult
 
+# Analysis tasks kept in flight per worker while files are still being collected
+IN_FLIGHT_PER_WORKER = 4
+
+# Files sent to a worker process per task when use_processes is set
+PROCESS_BATCH_SIZE = 64
+
+# Files per task on the thread pool; small enough that progress and the
+# first results still arrive promptly
+THREAD_BATCH_SIZE = 16
+
+# Completed files per progress bar update
+PROGRESS_BAR_STEP = 256
+
+# Units for _convert_bytes, one per power of 1024
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# How long get_progress_info reuses its last snapshot, in seconds
+PROGRESS_CACHE_SECONDS = 0.25
+
+# Candidate files with these extensions are counted as text in the stats
+TEXT_EXTENSIONS = frozenset({'.txt', '.json', '.csv', '.log', '.cfg', '.conf', '.ini'})
+
+# (path, lowercased name, lowercased suffix, is scan candidate, size or None
+# when the file was not stat'ed) per listed file
+FileEntry = Tuple[str, str, str, bool, Optional[int]]
+
+# Whether os.scandir accepts a directory fd (POSIX), so entries can be
+# stat'ed relative to it
+SCANDIR_FD = os.scandir in os.supports_fd
+DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0)
+
+# macOS volume metadata directories that are never descended into
+SKIP_DIRECTORIES = frozenset({'.Spotlight-V100', '.Trashes', '.TemporaryItems'})
+
 
 class DiskScanner:
     """Main disk scanner class"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, scan_id: Optional[str] = None):
         self.config = config
         self.results = []
         self.lock = threading.Lock()
-        self.scan_id = self._generate_scan_id()
+        # Last get_progress_info snapshot and when it was taken (monotonic)
+        self._progress_cache = None
+        self._progress_cache_at = 0.0
+        # Per-thread CryptoDetector, built on a worker's first file
+        self._tls = threading.local()
+        # Hashed snapshots of the config extension sets for the collection loop
+        self._crypto_exts = frozenset(config.crypto_extensions)
+        self._crypto_content_exts = frozenset(config.crypto_content_extensions)
+        # Callers that track scans themselves (ScanManager) pass their own ID
+        self.scan_id = scan_id or self._generate_scan_id()
         self.scan_progress = {
             'scan_id': self.scan_id,
             'current_file': '',
@@ -29,6 +73,9 @@ class DiskScanner:
             'files_found': 0,
             'current_directory': '',
             'estimated_total_files': 0,
+            # estimated_total_files only counts files queued so far until
+            # the directory walk has finished
+            'collection_complete': False,
             'start_time': None,
             'scan_stats': {
                 'total_files_scanned': 0,
@@ -36,8 +83,6 @@ class DiskScanner:
                 'total_bytes_scanned': 0,
                 'file_types': {},
                 'largest_file': {'size': 0, 'path': ''},
-                'directories_scanned': [],
-                'extensions_found': set(),
                 'crypto_extensions': 0,
                 'text_files': 0,
                 'binary_files': 0,
@@ -54,94 +99,112 @@ class DiskScanner:
         self.scan_progress['current_file'] = 'Collecting files...'
         self.scan_progress['current_directory'] = str(self.config.scan_path)
         
-        # Get all files to scan
-        files_to_scan = self._collect_files()
+        # Files are analyzed as collection finds them, so workers start on
+        # the first files while the rest of the tree is still being walked
+        files_to_scan = self._iter_files()
         
-        if not files_to_scan:
+        # Scan files with progress bar; the total grows as files are queued.
+        # The bar is advanced in steps so tqdm's lock and redraw stay off the
+        # per-file path.
+        with tqdm(total=0, desc="Scanning files", mininterval=0.5) as pbar:
+            completed_count = 0
+            for file_path, result in self._analyze_files(files_to_scan):
+                completed_count += 1
+                if completed_count % PROGRESS_BAR_STEP == 0:
+                    pbar.total = max(self.scan_progress['estimated_total_files'], completed_count)
+                    pbar.update(PROGRESS_BAR_STEP)
+                
+                # Results arrive on this thread only, so progress and results
+                # are written without taking self.lock; readers just see
+                # individual dict assignments, which are atomic
+                self.scan_progress['files_scanned'] = completed_count
+                # Update current file being processed (use the file that just completed)
+                self.scan_progress['current_file'] = file_path
+                self.scan_progress['current_directory'] = os.path.dirname(file_path)
+                
+                if result:
+                    self.results.append(result)
+                    self.scan_progress['files_found'] = len(self.results)
+                    
+                    if self.config.verbose:
+                        print(f"✅ Found: {result.item_type} - {result.file_path}")
+            
+            pbar.total = completed_count
+            pbar.update(completed_count % PROGRESS_BAR_STEP)
+        
+        if completed_count == 0:
             print("⚠️  No files found to scan")
-            self.scan_progress['estimated_total_files'] = 0
             return []
-            
-        print(f"📁 Found {len(files_to_scan)} files to scan")
-        self.scan_progress['estimated_total_files'] = len(files_to_scan)
-        self.scan_progress['current_file'] = f'Starting scan of {len(files_to_scan)} files...'
         
-        # Scan files with progress bar
-        with ThreadPoolExecutor(max_workers=self.config.num_threads) as executor:
-            with tqdm(total=len(files_to_scan), desc="Scanning files") as pbar:
-                futures = {
-                    executor.submit(self._scan_file_with_progress, i, file_path, len(files_to_scan)): (i, pbar)
-                    for i, file_path in enumerate(files_to_scan)
-                }
-                
-                completed_count = 0
-                for future in as_completed(futures):
-                    i, pbar = futures[future]
+        print(f"🎯 Scan complete! Found {len(self.results)} crypto-related items")
+        return self.results
+    
+    def _analyze_files(self, files_to_scan: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, Optional[ScanResult]]]:
+        """Analyze files on the worker pool, yielding (file_path, result) as they finish
+        
+        Files are submitted as they arrive with a bounded number of tasks in
+        flight, so pending work stays small however large the tree is.
+        """
+        max_in_flight = IN_FLIGHT_PER_WORKER * self.config.num_threads
+        
+        if self.config.use_processes:
+            # Detection is CPU-bound; worker processes sidestep the GIL.
+            # Each worker builds its own detector, and batching amortizes IPC.
+            from crypto_detector import init_worker, analyze_batch
+            with ProcessPoolExecutor(max_workers=self.config.num_threads,
+                                     initializer=init_worker,
+                                     initargs=(self.config,)) as executor:
+                batches = ((batch,) for batch in _batched(files_to_scan, PROCESS_BATCH_SIZE))
+                for (batch,), future in _submit_bounded(executor, analyze_batch, batches, max_in_flight):
                     try:
-                        result = future.result()
-                        pbar.update(1)
-                        completed_count += 1
-                        
-                        # Update progress (thread-safe)
-                        with self.lock:
-                            # Use completed_count for accurate progress
-                            self.scan_progress['files_scanned'] = completed_count
-                            # Update current file being processed (use the file that just completed)
-                            if result and hasattr(result, 'file_path'):
-                                self.scan_progress['current_file'] = result.file_path
-                                file_path_obj = Path(result.file_path)
-                                self.scan_progress['current_directory'] = str(file_path_obj.parent)
-                            elif i < len(files_to_scan):
-                                current_file = files_to_scan[i]
-                                self.scan_progress['current_file'] = current_file
-                                file_path_obj = Path(current_file)
-                                self.scan_progress['current_directory'] = str(file_path_obj.parent)
-                        
-                        if result:
-                            with self.lock:
-                                self.results.append(result)
-                                self.scan_progress['files_found'] = len(self.results)
-                                
-                            if self.config.verbose:
-                                print(f"✅ Found: {result.item_type} - {result.file_path}")
+                        results = future.result()
                     except Exception as e:
+                        # A worker killed mid-batch (BrokenProcessPool) or a
+                        # batch that fails to pickle loses only that batch
                         if self.config.verbose:
-                            print(f"⚠️  Error processing file: {e}")
-                        completed_count += 1
-                        with self.lock:
-                            self.scan_progress['files_scanned'] = completed_count
+                            print(f"⚠️  Error processing files: {e}")
+                        results = [None] * len(batch)
+                    yield from zip((file_path for file_path, _ in batch), results)
+            return
         
-        print(f"🎯 Scan complete! Found {len(self.results)} crypto-related items")
-        return self.results
+        # Threads take small batches too, so the per-file cost of a Future,
+        # the work queue and the completion wake-up is spread over a batch
+        batches = ((batch,) for batch in _batched(files_to_scan, THREAD_BATCH_SIZE))
+        with ThreadPoolExecutor(max_workers=self.config.num_threads) as executor:
+            for (batch,), future in _submit_bounded(executor, self._scan_batch,
+                                                    batches, max_in_flight):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    if self.config.verbose:
+                        print(f"⚠️  Error processing files: {e}")
+                    results = [None] * len(batch)
+                yield from zip((file_path for file_path, _ in batch), results)
     
     def get_progress_info(self) -> dict:
         """Get current scan progress"""
         if self.scan_progress['start_time'] is None:
-            # Convert sets to lists for JSON serialization
-            progress = self.scan_progress.copy()
-            if 'scan_stats' in progress and 'extensions_found' in progress['scan_stats']:
-                if isinstance(progress['scan_stats']['extensions_found'], set):
-                    progress['scan_stats'] = progress['scan_stats'].copy()
-                    progress['scan_stats']['extensions_found'] = list(progress['scan_stats']['extensions_found'])
-            return progress
+            return self.scan_progress.copy()
             
+        # Status polls from several clients within the same instant share
+        # one snapshot instead of each copying the progress dicts
+        now = time.monotonic()
+        if self._progress_cache is not None and now - self._progress_cache_at < PROGRESS_CACHE_SECONDS:
+            return self._progress_cache
+        
         elapsed_time = time.time() - self.scan_progress['start_time']
         files_scanned = self.scan_progress['files_scanned']
         total_files = self.scan_progress['estimated_total_files']
         
         progress_data = self.scan_progress.copy()
         
-        # Convert sets to lists for JSON serialization
-        if 'scan_stats' in progress_data:
-            scan_stats = progress_data['scan_stats'].copy()
-            if 'extensions_found' in scan_stats and isinstance(scan_stats['extensions_found'], set):
-                scan_stats['extensions_found'] = list(scan_stats['extensions_found'])
-            # Limit directories list to avoid huge JSON responses
-            if 'directories_scanned' in scan_stats and isinstance(scan_stats['directories_scanned'], list):
-                scan_stats['directories_scanned'] = scan_stats['directories_scanned'][-50:]  # Keep last 50
-            progress_data['scan_stats'] = scan_stats
-        
-        if total_files > 0:
+        progress_data['scan_stats'] = progress_data['scan_stats'].copy()
+        
+        # Files are scanned while the walk still queues more, so until it
+        # ends the total trails just behind files_scanned; report no
+        # percentage or ETA rather than a near-100% estimate
+        collection_complete = progress_data['collection_complete']
+        if collection_complete and total_files > 0:
             progress_data['progress_percent'] = (files_scanned / total_files) * 100
         else:
             progress_data['progress_percent'] = 0
@@ -149,7 +212,7 @@ class DiskScanner:
         progress_data['elapsed_time'] = elapsed_time
         progress_data['files_per_second'] = files_scanned / elapsed_time if elapsed_time > 0 else 0
         
-        if files_scanned > 0 and total_files > 0:
+        if collection_complete and files_scanned > 0 and total_files > 0:
             remaining_files = total_files - files_scanned
             if progress_data['files_per_second'] > 0:
                 progress_data['eta_seconds'] = remaining_files / progress_data['files_per_second']
@@ -158,11 +221,13 @@ class DiskScanner:
         else:
             progress_data['eta_seconds'] = 0
             
+        self._progress_cache = progress_data
+        self._progress_cache_at = now
         return progress_data
     
-    def _collect_files(self) -> List[str]:
-        """Collect all files to scan with detailed statistics"""
-        files = []
+    def _iter_files(self) -> Iterator[Tuple[str, int]]:
+        """Yield (file_path, file_size) for each file to scan, gathering detailed statistics"""
+        files_count = 0
         scan_path = Path(self.config.scan_path)
         
         if not scan_path.exists():
@@ -174,147 +239,184 @@ class DiskScanner:
         self.scan_progress['current_file'] = 'Collecting files...'
         self.scan_progress['current_directory'] = str(scan_path)
         
+        # Statistics are only written from this thread (the walker threads
+        # just list directories), so no lock is taken. The per-file totals
+        # are kept in locals and published once per directory.
+        stats = self.scan_progress['scan_stats']
+        files_seen = stats['total_files_scanned']
+        bytes_seen = stats['total_bytes_scanned']
         try:
-            # Use os.walk instead of rglob to avoid permission issues
-            import os
-            
-            file_count = 0
-            for root, dirs, files_list in os.walk(str(scan_path)):
+            for root, dir_depth, file_entries in self._walk_directories(str(scan_path)):
                 # Update current directory being scanned
                 self.scan_progress['current_directory'] = root
-                if file_count % 100 == 0:  # Update every 100 files to avoid overhead
-                    self.scan_progress['current_file'] = f'Scanning directory: {Path(root).name}...'
-                # Skip problematic directories to avoid permission errors
-                dirs[:] = [d for d in dirs if not (d.startswith('.') and d in ['.Spotlight-V100', '.Trashes', '.TemporaryItems'])]
-                
-                # Check depth limit BEFORE processing
-                rel_path = Path(root).relative_to(scan_path) if Path(root) != scan_path else Path('.')
-                dir_depth = len(rel_path.parts) - 1 if rel_path != Path('.') else 0
-                
-                # Enforce max depth
-                if dir_depth > self.config.max_depth:
-                    dirs[:] = []  # Don't descend further
-                    continue
+                if files_count % 100 == 0:  # Update every 100 files to avoid overhead
+                    self.scan_progress['current_file'] = f'Scanning directory: {os.path.basename(root)}...'
                 
                 if dir_depth > 0:  # Don't count root directory
-                    with self.lock:
-                        self.scan_progress['scan_stats']['total_directories'] += 1
-                        self.scan_progress['scan_stats']['scan_depth_reached'] = max(
-                            self.scan_progress['scan_stats']['scan_depth_reached'], 
-                            dir_depth
-                        )
-                        # Limit directories list size
-                        if len(self.scan_progress['scan_stats']['directories_scanned']) < 1000:
-                            self.scan_progress['scan_stats']['directories_scanned'].append(root)
+                    stats['total_directories'] += 1
+                    stats['scan_depth_reached'] = max(stats['scan_depth_reached'], dir_depth)
                 
                 # Process files
-                for filename in files_list:
-                    file_path = os.path.join(root, filename)
-                    entry = Path(file_path)
+                for file_path, name_lower, suffix, is_candidate, file_size in file_entries:
+                    files_seen += 1
+                    if files_seen % 1000 == 0:
+                        self.scan_progress['current_file'] = f'Collecting files... ({files_seen} found so far)'
                     
-                    try:
-                        if entry.is_file() and not entry.is_symlink():
-                            file_info = entry.stat()
-                            file_size = file_info.st_size
-                            
-                            # Update statistics (thread-safe for progress updates)
-                            with self.lock:
-                                self.scan_progress['scan_stats']['total_files_scanned'] += 1
-                                self.scan_progress['scan_stats']['total_bytes_scanned'] += file_size
-                                
-                                # Update estimated total during collection (rough estimate)
-                                if self.scan_progress['scan_stats']['total_files_scanned'] % 1000 == 0:
-                                    # Estimate: assume 10-20% of files will be scanned
-                                    estimated = int(self.scan_progress['scan_stats']['total_files_scanned'] * 0.15)
-                                    self.scan_progress['estimated_total_files'] = estimated
-                                    self.scan_progress['current_file'] = f'Collecting files... ({self.scan_progress["scan_stats"]["total_files_scanned"]} found so far)'
-                            
-                            # Track largest file
-                            if file_size > self.scan_progress['scan_stats']['largest_file']['size']:
-                                self.scan_progress['scan_stats']['largest_file'] = {
-                                    'size': file_size,
-                                    'path': file_path
-                                }
-                            
-                            # Track file extensions
-                            ext = entry.suffix.lower() or 'no_extension'
-                            if ext not in self.scan_progress['scan_stats']['file_types']:
-                                self.scan_progress['scan_stats']['file_types'][ext] = {'count': 0, 'bytes': 0}
-                            self.scan_progress['scan_stats']['file_types'][ext]['count'] += 1
-                            self.scan_progress['scan_stats']['file_types'][ext]['bytes'] += file_size
-                            self.scan_progress['scan_stats']['extensions_found'].add(ext)
-                            
-                            # Categorize files
-                            if self._is_crypto_related_file(entry):
-                                self.scan_progress['scan_stats']['crypto_extensions'] += 1
-                                
-                            # Skip files that are too large for actual scanning
-                            if file_size > self.config.max_file_size:
-                                continue
-                                
-                            # Add files that should be scanned - be more inclusive
-                            should_scan = (
-                                self._is_crypto_related_file(entry) or 
-                                self._has_crypto_pattern_in_name(entry) or
-                                entry.suffix.lower() in self.config.crypto_content_extensions
-                            )
-                            
-                            if should_scan:
-                                # Also categorize files for statistics
-                                if entry.suffix.lower() in ['.txt', '.json', '.csv', '.log', '.cfg', '.conf', '.ini']:
-                                    self.scan_progress['scan_stats']['text_files'] += 1
-                                else:
-                                    self.scan_progress['scan_stats']['binary_files'] += 1
-                                    
-                                files.append(file_path)
-                                file_count += 1
-                                
-                    except (PermissionError, OSError, FileNotFoundError):
-                        # Skip problematic files silently
+                    # Track file extensions
+                    ext = suffix or 'no_extension'
+                    file_type = stats['file_types'].get(ext)
+                    if file_type is None:
+                        file_type = stats['file_types'][ext] = {'count': 0, 'bytes': 0}
+                    file_type['count'] += 1
+                    
+                    # Categorize files
+                    if suffix in self._crypto_exts:
+                        stats['crypto_extensions'] += 1
+                    
+                    # Only files that may be scanned are sized, unless full
+                    # size statistics were asked for
+                    if file_size is None:
                         continue
+                    
+                    bytes_seen += file_size
+                    file_type['bytes'] += file_size
+                    
+                    # Track largest file
+                    if file_size > stats['largest_file']['size']:
+                        stats['largest_file'] = {
+                            'size': file_size,
+                            'path': file_path
+                        }
+                    
+                    # Skip files that are too large for actual scanning
+                    if not is_candidate or file_size > self.config.max_file_size:
+                        continue
+                    
+                    # Also categorize files for statistics
+                    if suffix in TEXT_EXTENSIONS:
+                        stats['text_files'] += 1
+                    else:
+                        stats['binary_files'] += 1
+                    
+                    # Keep the size so results don't stat the file again
+                    files_count += 1
+                    self.scan_progress['estimated_total_files'] = files_count
+                    yield file_path, file_size
+                
+                stats['total_files_scanned'] = files_seen
+                stats['total_bytes_scanned'] = bytes_seen
                         
         except PermissionError as e:
             print(f"⚠️  Permission denied accessing some directories: {e}")
         except Exception as e:
             print(f"⚠️  Error collecting files: {e}")
         
+        stats['total_files_scanned'] = files_seen
+        stats['total_bytes_scanned'] = bytes_seen
+        
         print(f"📊 Collection complete:")
         print(f"   Found {self.scan_progress['scan_stats']['total_files_scanned']} files")
         print(f"   Scanned {self.scan_progress['scan_stats']['total_directories']} directories") 
         print(f"   Total size: {self._convert_bytes(self.scan_progress['scan_stats']['total_bytes_scanned'])}")
-        print(f"   Files to analyze: {len(files)}")
+        print(f"   Files to analyze: {files_count}")
         
-        print(f"   Files under {self.config.max_file_size} limit: {len(files)}")
+        print(f"   Files under {self.config.max_file_size} limit: {files_count}")
         print(f"   File types included: crypto extensions + {list(self.config.crypto_content_extensions)}")
         
         # Update progress to show collection is complete
-        self.scan_progress['current_file'] = f'Collection complete: {len(files)} files ready to scan'
-        self.scan_progress['estimated_total_files'] = len(files)
-            
-        return files
+        self.scan_progress['current_file'] = f'Collection complete: {files_count} files ready to scan'
+        self.scan_progress['estimated_total_files'] = files_count
+        self.scan_progress['collection_complete'] = True
+    
+    def _walk_directories(self, scan_path: str) -> Iterator[Tuple[str, int, List[FileEntry]]]:
+        """Yield (directory, depth, file entries) for each directory within max_depth
+        
+        Directories are listed concurrently on a thread pool (scandir and
+        lstat release the GIL), so high-latency volumes keep several
+        readdirs in flight. Results arrive in completion order.
+        """
+        with ThreadPoolExecutor(max_workers=self.config.num_threads) as executor:
+            pending = {executor.submit(self._list_directory, scan_path, 0)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    listing = future.result()
+                    if listing is None:
+                        continue
+                    
+                    root, rel_depth, files, subdirs = listing
+                    for path in subdirs:
+                        pending.add(executor.submit(self._list_directory, path, rel_depth + 1))
+                    
+                    yield root, max(rel_depth - 1, 0), files
+    
+    def _list_directory(self, root: str, rel_depth: int) -> Optional[Tuple[str, int, List[FileEntry], List[str]]]:
+        """Walker task: list one directory into its regular files and subdirectories
+        
+        Entry types come from the d_type that readdir already returns. Files
+        are classified by name here, and only scan candidates (or every file
+        with full_file_stats) are lstat'ed; others carry a size of None.
+        """
+        # Depth as counted by the original os.walk loop: the scan path and its
+        # direct children are both depth 0, deeper levels add one each
+        if max(rel_depth - 1, 0) > self.config.max_depth:
+            return None
+        
+        files = []
+        subdirs = []
+        try:
+            # Listing through a directory fd makes each lstat an fstatat
+            # relative to it, instead of re-resolving the full path
+            dir_fd = os.open(root, DIR_OPEN_FLAGS) if SCANDIR_FD else None
+        except OSError:
+            return None
+        try:
+            with os.scandir(root if dir_fd is None else dir_fd) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRECTORIES:
+                                subdirs.append(os.path.join(root, entry.name))
+                        elif entry.is_file(follow_symlinks=False):
+                            # Lowercase once; suffix and name pattern checks share it
+                            name_lower = entry.name.lower()
+                            suffix = _file_suffix(name_lower)
+                            is_candidate = self._is_scan_candidate(name_lower, suffix)
+                            if is_candidate or self.config.full_file_stats:
+                                file_size = entry.stat(follow_symlinks=False).st_size
+                            else:
+                                file_size = None
+                            files.append((os.path.join(root, entry.name), name_lower,
+                                          suffix, is_candidate, file_size))
+                    except OSError:
+                        continue
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            return None
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        
+        return root, rel_depth, files, subdirs
     
     def _generate_scan_id(self) -> str:
         """Generate unique scan ID"""
-        import time
-        import os
-        from datetime import datetime
-        
         # Create ID from timestamp, drive name, and random component
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         drive_name = Path(self.config.scan_path).name.replace('/', '_').replace(' ', '_')
         
         # Add small random component to ensure uniqueness even when scanning same drive quickly
-        random_suffix = hex(int(time.time() * 1000000) % 10000)[2:].zfill(4)
+        random_suffix = os.urandom(2).hex()
         
         return f"scan_{timestamp}_{drive_name}_{random_suffix}"
     
     def _convert_bytes(self, bytes_value: int) -> str:
         """Convert bytes to human readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes_value < 1024.0:
-                return f"{bytes_value:.1f} {unit}"
-            bytes_value /= 1024.0
-        return f"{bytes_value:.1f} TB"
+        if bytes_value < 1024:
+            return f"{bytes_value:.1f} B"
+        # Every 10 bits is one 1024x unit step
+        idx = min((int(bytes_value).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{bytes_value / (1 << (idx * 10)):.1f} {SIZE_UNITS[idx]}"
     
     def get_scan_summary(self) -> dict:
         """Get comprehensive scan summary"""
@@ -324,8 +426,8 @@ class DiskScanner:
         elapsed_time = time.time() - self.scan_progress['start_time']
         stats = self.scan_progress['scan_stats']
         
-        # Convert extensions set to list for JSON serialization
-        extensions_found = list(stats['extensions_found'])
+        # Every extension seen has an entry in the file type histogram
+        extensions_found = list(stats['file_types'])
         
         # Count crypto-related files
         crypto_file_count = sum(1 for ext, data in stats['file_types'].items()
@@ -378,45 +480,56 @@ class DiskScanner:
         
         return summary
     
-    def _is_crypto_related_file(self, file_path: Path) -> bool:
-        """Check if file has crypto-related extension"""
-        return file_path.suffix.lower() in self.config.crypto_extensions
+    def _is_scan_candidate(self, name_lower: str, suffix: str) -> bool:
+        """Whether a file is scanned (size permitting), judged from its name alone"""
+        # Add files that should be scanned - be more inclusive
+        return (
+            suffix in self._crypto_exts or
+            suffix in self._crypto_content_exts or
+            self._has_crypto_pattern_in_name(name_lower)
+        )
     
-    def _has_crypto_pattern_in_name(self, file_path: Path) -> bool:
-        """Check if file name matches crypto patterns"""
-        name = file_path.name.lower()
-        
-        for wallet_type, patterns in self.config.wallet_patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in name:
-                    return True
-        return False
+    def _has_crypto_pattern_in_name(self, name_lower: str) -> bool:
+        """Check if a lowercased file name matches crypto patterns"""
+        # One C-level scan over the alternation of every wallet pattern
+        return self.config.wallet_filename_re.search(name_lower) is not None
     
-    def _scan_file(self, file_path: str) -> ScanResult:
-        """Scan a single file for crypto-related content"""
-        try:
+    def _get_detector(self):
+        """Return the calling thread's CryptoDetector, building it on first use"""
+        detector = getattr(self._tls, 'detector', None)
+        if detector is None:
             # Import here to avoid circular import
             from crypto_detector import CryptoDetector
-            detector = CryptoDetector(self.config)
-            return detector.analyze_file(file_path)
-        except Exception as e:
-            if self.config.verbose:
-                print(f"⚠️  Error scanning {file_path}: {e}")
-            return None
+            detector = self._tls.detector = CryptoDetector(self.config)
+        return detector
     
-    def _scan_file_with_progress(self, index: int, file_path: str, total_files: int) -> ScanResult:
+    def _scan_batch(self, batch: List[Tuple[str, int]]) -> List[Optional[ScanResult]]:
+        """Thread pool task: scan a batch of (file_path, file_size) pairs"""
+        if self.config.verbose:
+            return [self._scan_file_with_progress(file_path, file_size)
+                    for file_path, file_size in batch]
+        
+        # The completion loop already publishes current_file per finished
+        # file, so quiet scans skip the per-file progress update and lock
+        detector = self._get_detector()
+        results = []
+        for file_path, file_size in batch:
+            try:
+                results.append(detector.analyze_file(file_path, file_size))
+            except Exception:
+                results.append(None)
+        return results
+    
+    def _scan_file_with_progress(self, file_path: str, file_size: int) -> ScanResult:
         """Scan a single file with progress tracking"""
         try:
             # Update current file path for progress tracking (thread-safe)
             with self.lock:
-                self.scan_progress['current_file'] = str(file_path)
-                file_path_obj = Path(file_path)
-                self.scan_progress['current_directory'] = str(file_path_obj.parent)
+                self.scan_progress['current_file'] = file_path
+                self.scan_progress['current_directory'] = os.path.dirname(file_path)
             
             # Scan the file
-            from crypto_detector import CryptoDetector
-            detector = CryptoDetector(self.config)
-            result = detector.analyze_file(file_path)
+            result = self._get_detector().analyze_file(file_path, file_size)
             
             return result
             
@@ -425,3 +538,35 @@ class DiskScanner:
                 print(f"⚠️  Error scanning {file_path}: {e}")
             return None
 
+
+def _file_suffix(name: str) -> str:
+    """Final suffix of a file name, with the same rules as PurePath.suffix"""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ''
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    """Group items into lists of at most size"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _submit_bounded(executor, fn, arg_tuples: Iterable[tuple], max_in_flight: int):
+    """Submit fn(*args) per item, yielding (args, future) as futures complete
+    
+    At most max_in_flight futures are pending at once; arg_tuples is only
+    advanced when there is room, so it can be a lazy generator.
+    """
+    in_flight = {}
+    for args in arg_tuples:
+        if len(in_flight) >= max_in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield in_flight.pop(future), future
+        in_flight[executor.submit(fn, *args)] = args
+    
+    for future in as_completed(in_flight):
+        yield in_flight[future], future
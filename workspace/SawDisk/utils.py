@@ -5,6 +5,12 @@ import os
 import stat
 from pathlib import Path
 
+# Units for format_file_size, one per power of the divisor
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Leading bytes of common binary formats (PNG, JPEG, ZIP) for is_binary_file
+BINARY_MAGIC = (b'\x89PNG', b'\xff\xd8\xff', b'PK')
+
 
 def format_file_size(size_bytes: int, use_decimal: bool = True) -> str:
     """
@@ -15,37 +21,37 @@ def format_file_size(size_bytes: int, use_decimal: bool = True) -> str:
         use_decimal: If True, use decimal units (1000-based) like macOS.
                      If False, use binary units (1024-based) like traditional Linux.
     """
+    divisor = 1000 if use_decimal else 1024
+    if size_bytes < divisor:
+        return f"{float(size_bytes):.1f} B"
+    
     if use_decimal:
         # Decimal units (macOS style): 1 KB = 1000 bytes, 1 GB = 1,000,000,000 bytes
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        divisor = 1000.0
+        # Every 3 digits is one 1000x unit step
+        idx = min((len(str(int(size_bytes))) - 1) // 3, len(SIZE_UNITS) - 1)
     else:
         # Binary units (traditional): 1 KB = 1024 bytes, 1 GB = 1,073,741,824 bytes
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        divisor = 1024.0
-    
-    size = float(size_bytes)
-    for unit in units:
-        if size < divisor:
-            return f"{size:.1f} {unit}"
-        size /= divisor
-    return f"{size:.1f} {units[-1]}"
+        # Every 10 bits is one 1024x unit step
+        idx = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / divisor ** idx:.1f} {SIZE_UNITS[idx]}"
 
 
 def is_binary_file(file_path: str, chunk_size: int = 1024) -> bool:
     """Simple check if file is binary"""
     try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(chunk_size)
-            # If chunk contains null bytes, likely binary
-            if b'\0' in chunk:
-                return True
-            # Check for common binary patterns
-            if chunk[0:2] in [b'\x89PNG', b'\xff\xd8\xff', b'\x50\x4b']:
-                return True
-            return False
+        # Raw fd read: no buffered file object for a single small read
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            chunk = os.read(fd, chunk_size)
+        finally:
+            os.close(fd)
     except Exception:
         return False
+    # If chunk contains null bytes, likely binary
+    if b'\0' in chunk:
+        return True
+    # Check for common binary patterns; startswith compares each whole prefix
+    return chunk.startswith(BINARY_MAGIC)
 
 
 def format_confidence(confidence: float) -> str:
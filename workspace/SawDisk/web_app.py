@@ -4,142 +4,103 @@ SawDisk Web Interface
 A modern web-based dashboard for the SawDisk crypto scanner.
 """
 
+import atexit
 import os
 import json
 import threading
 import time
-from datetime import datetime
+import functools
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, make_response, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import NotFound
+import orjson
 import psutil
 
 import sys
 sys.path.append('/app/workspace/SawDisk')
 
-from scanner import DiskScanner
-from reporter import ReportGenerator
-from config import Config
-from scan_history import ScanHistoryManager, ScanRecord
+from scan_history import ScanHistoryManager
 from scan_manager import ScanManager
 from utils import format_file_size, format_confidence
 
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    mimetype = 'application/json'
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # orjson already produces bytes; skip the str round trip of dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype=self.mimetype
+        )
+
 # Initialize Flask app
 app = Flask(__name__, 
            template_folder='templates',
            static_folder='static')
+app.json = OrjsonProvider(app)
+# When served behind a front server that honours X-Sendfile, report files
+# are handed to it by path instead of being streamed through Python
+app.config['USE_X_SENDFILE'] = os.environ.get('SAWDISK_X_SENDFILE') == '1'
 CORS(app)
 
-# Global variables for scan status
-scan_status = {
-    'is_running': False,
-    'progress': 0,
-    'current_file': '',
-    'results': [],
-    'start_time': None,
-    'errors': []
-}
+# System mountpoints never listed as scan targets
+SKIP_MOUNTPOINTS = frozenset({'/', '/proc', '/sys', '/dev', '/run', '/tmp'})
+# Mountpoint prefixes never listed: system trees, Docker bind and runtime mounts
+SKIP_MOUNT_PREFIXES = ('/etc/', '/dev/', '/var/', '/app/', '/run/')
+# Kernel pseudo filesystems, which never hold scan targets; dropped before
+# any mountpoint checks or disk_usage calls. disk_partitions(all=False)
+# normally filters these already, so this only guards against psutil
+# letting one through. Block-backed media (ISO images, optical discs,
+# squashfs images) stay listed: they can hold wallet backups
+PSEUDO_FSTYPES = frozenset({
+    'tmpfs', 'devtmpfs', 'proc', 'sysfs', 'cgroup', 'cgroup2', 'overlay',
+    'devpts', 'mqueue', 'securityfs', 'debugfs', 'tracefs', 'pstore',
+    'bpf', 'configfs', 'fusectl', 'hugetlbfs', 'autofs', 'binfmt_misc',
+    'nsfs', 'ramfs', 'efivarfs'
+})
+
+# Browser cache lifetime for generated reports, in seconds (one year)
+REPORT_MAX_AGE = 31536000
+
+# Seconds between status events on /api/scan/events while a scan runs
+SSE_STATUS_INTERVAL = 1.0
+
+# /api/browse stops counting a directory's files past this many
+BROWSE_FILE_COUNT_LIMIT = 1000
 
 # Global scan manager (replaces individual scanner)
 scan_manager = ScanManager()
 
 # Legacy variable for compatibility
 scan_history = scan_manager.scan_history
+# Fold the append log back into scan_history.json on a clean shutdown
+atexit.register(scan_history.close)
 
-# Global scanner reference (for legacy compatibility)
-current_scanner = None
-
-def run_scan_async(config_dict):
-    """Run scan in background thread"""
-    global scan_status, scan_history
-    
-    try:
-        scan_status['is_running'] = True
-        scan_status['start_time'] = time.time()
-        scan_status['progress'] = 0
-        scan_status['current_file'] = 'Initializing...'
-        scan_status['errors'] = []
-        
-        # Create config object
-        config = Config(**config_dict)
-        
-        # Initialize scanner (this generates unique scan_id)
-        scanner = DiskScanner(config)
-        global current_scanner
-        current_scanner = scanner
-        
-        # Create exclusive scan directory
-        scan_dir = scan_history.create_scan_directory(scanner.scan_id)
-        config.output_dir = str(scan_dir)
-        
-        # Create initial scan record
-        scan_record = ScanRecord(
-            scan_id=scanner.scan_id,
-            timestamp=datetime.now().isoformat(),
-            drive_name=Path(scanner.config.scan_path).name,
-            scan_path=str(scanner.config.scan_path),
-            files_found=0,
-            total_files_scanned=0,
-            scan_duration=0,
-            drive_size="",
-            report_files={},
-            status='running'
-        )
-        scan_history.save_scan(scan_record)
-        
-        # Update scan status with scan_id
-        scan_status['scan_id'] = scanner.scan_id
-        scan_status['current_file'] = f"Scanning {config.scan_path}..."
-        
-        print(f"📁 Created exclusive scan directory: {scan_dir}")
-        print(f"🔍 Scan ID: {scanner.scan_id}")
-        
-        # Start scanning
-        results = scanner.scan()
-        
-        # Store results
-        scan_status['results'] = [
-            {
-                'file_path': r.file_path,
-                'item_type': r.item_type,
-                'confidence': r.confidence,
-                'file_size': r.file_size,
-                'scan_time': r.scan_time,
-                'details': r.details
-            }
-            for r in results
-        ]
-        
-        # Generate report in exclusive directory
-        if results:
-            reporter = ReportGenerator(config)
-            report_path = reporter.generate_report(results)
-            scan_status['report_path'] = report_path
-            
-            # Update scan record with final results
-            scan_record.files_found = len(results)
-            scan_record.total_files_scanned = scanner.scan_progress['scan_stats']['total_files_scanned']
-            scan_record.scan_duration = time.time() - scan_status['start_time']
-            scan_record.report_files = {'html': report_path} if report_path else {}
-            scan_record.status = 'completed'
-            
-            # Calculate drive size
-            try:
-                usage = psutil.disk_usage(config.scan_path)
-                scan_record.drive_size = f"{usage.total / (1024**3):.1f} GB"
-            except:
-                scan_record.drive_size = "Unknown"
-                
-            scan_history.save_scan(scan_record)
-        
-        scan_status['progress'] = 100
-        scan_status['current_file'] = 'Scan completed!'
-        
-    except Exception as e:
-        scan_status['errors'].append(str(e))
-        scan_status['current_file'] = f'Error: {str(e)}'
-    finally:
-        scan_status['is_running'] = False
+def etagged(view):
+    """Tag a JSON view's 200 responses with a content ETag and answer
+    matching If-None-Match requests with 304 Not Modified"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            response.add_etag()
+            response.make_conditional(request)
+        return response
+    return wrapper
 
 @app.route('/')
 def dashboard():
@@ -163,7 +124,40 @@ _system_info_cache = {
     'ttl': 10  # Cache for 10 seconds
 }
 
+# Mount table snapshot; mounts change far less often than the dashboard polls
+_partitions_cache = {
+    'data': None,
+    'timestamp': 0,
+    'ttl': 60  # Cache for 60 seconds
+}
+
+def _cached_partitions():
+    """Physical-device partitions from psutil, reused for the cache TTL"""
+    current_time = time.time()
+    if (_partitions_cache['data'] is None or
+        current_time - _partitions_cache['timestamp'] >= _partitions_cache['ttl']):
+        # all=False keeps only physical filesystems, so pseudo mounts never
+        # reach the per-mount isdir/disk_usage calls below
+        _partitions_cache['data'] = psutil.disk_partitions(all=False)
+        _partitions_cache['timestamp'] = current_time
+    return _partitions_cache['data']
+
+# Threads for overlapping per-mount disk_usage (statvfs) calls
+_usage_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='disk-usage')
+
+def _mount_usage(mount_point):
+    """psutil.disk_usage for a mounted directory, None if it is a file or unreadable"""
+    try:
+        # Only include mount points that look like actual volumes
+        # Skip if it's a file (like /etc/resolv.conf bind mount)
+        if not os.path.isdir(mount_point):
+            return None
+        return psutil.disk_usage(mount_point)
+    except (PermissionError, OSError, FileNotFoundError):
+        return None
+
 @app.route('/api/system-info')
+@etagged
 def system_info():
     """Get system information (with caching to improve performance)"""
     global _system_info_cache
@@ -177,44 +171,40 @@ def system_info():
     mounts = []
     seen_mountpoints = set()  # Track to avoid duplicates
     
-    # Check all partitions (limit to avoid blocking)
+    # Check all partitions
     try:
-        partitions = psutil.disk_partitions()
-        for partition in partitions[:50]:  # Limit to first 50 partitions
-            try:
-                mount_point = partition.mountpoint
-                
-                # Skip system directories and special mounts
-                if (mount_point in ['/', '/proc', '/sys', '/dev', '/run', '/tmp'] or
-                    mount_point.startswith('/etc/') or
-                    mount_point.startswith('/dev/') or
-                    mount_point.startswith('/var/') or
-                    mount_point.startswith('/app/') or  # Skip Docker bind mounts
-                    mount_point.startswith('/run/') or  # Skip Docker runtime mounts
-                    '/oldroot' in mount_point or  # Skip Docker internal mounts
-                    '/var/lib' in mount_point or  # Skip Docker internal mounts
-                    mount_point in seen_mountpoints):
-                    continue
-                
-                # Only include mount points that look like actual volumes
-                # Skip if it's a file (like /etc/resolv.conf bind mount)
-                if not os.path.isdir(mount_point):
-                    continue
-                
-                usage = psutil.disk_usage(mount_point)
-                seen_mountpoints.add(mount_point)
-                
-                mounts.append({
-                    'device': partition.device,
-                    'mountpoint': mount_point,
-                    'fstype': partition.fstype,
-                    'total': format_file_size(usage.total, use_decimal=True),
-                    'used': format_file_size(usage.used, use_decimal=True),
-                    'free': format_file_size(usage.free, use_decimal=True),
-                    'percent': usage.percent
-                })
-            except (PermissionError, OSError, FileNotFoundError):
+        partitions = [p for p in _cached_partitions()
+                      if p.fstype not in PSEUDO_FSTYPES]
+        candidates = {}
+        for partition in partitions:
+            mount_point = partition.mountpoint
+            
+            # Skip system directories and special mounts
+            if (mount_point in SKIP_MOUNTPOINTS or
+                mount_point.startswith(SKIP_MOUNT_PREFIXES) or
+                '/oldroot' in mount_point or  # Skip Docker internal mounts
+                '/var/lib' in mount_point or  # Skip Docker internal mounts
+                mount_point in candidates):
+                continue
+            candidates[mount_point] = partition
+        
+        # statvfs can block for a long time on network/FUSE mounts; query
+        # them all at once so the wait is the slowest mount, not the sum
+        usages = _usage_pool.map(_mount_usage, candidates)
+        for (mount_point, partition), usage in zip(candidates.items(), usages):
+            if usage is None:
                 continue
+            seen_mountpoints.add(mount_point)
+            
+            mounts.append({
+                'device': partition.device,
+                'mountpoint': mount_point,
+                'fstype': partition.fstype,
+                'total': format_file_size(usage.total, use_decimal=True),
+                'used': format_file_size(usage.used, use_decimal=True),
+                'free': format_file_size(usage.free, use_decimal=True),
+                'percent': usage.percent
+            })
     except Exception as e:
         print(f"Error getting partitions: {e}")
     
@@ -247,16 +237,21 @@ def system_info():
         try:
             # Get the parent mount info first
             parent_usage = psutil.disk_usage(volumes_path)
-            items = os.listdir(volumes_path)
+            parent_dev = os.stat(volumes_path).st_dev
+            # Entry types come with the directory listing (d_type), so plain
+            # volumes need no islink/isdir stat of their own
+            with os.scandir(volumes_path) as it:
+                entries = list(it)
             
-            for item in items[:20]:  # Limit to first 20 items
+            for entry in entries[:20]:  # Limit to first 20 items
+                item = entry.name
                 if item == 'PoC' or item.startswith('.'):
                     continue
                     
-                item_path = os.path.join(volumes_path, item)
+                item_path = entry.path
                 
                 # Handle symlinks - check if they point to valid volumes
-                if os.path.islink(item_path):
+                if entry.is_symlink():
                     real_path = os.path.realpath(item_path)
                     # Skip symlinks pointing to /, /proc, /sys, etc.
                     if real_path in ['/', '/proc', '/sys', '/dev'] or real_path.startswith('/proc') or real_path.startswith('/sys'):
@@ -266,16 +261,24 @@ def system_info():
                     if os.path.isdir(real_path) and real_path != item_path and real_path != '/':
                         print(f"Following symlink {item} -> {real_path}")
                         item_path = real_path
-                    # If symlink points to root or invalid location, skip
-                    elif real_path == '/' or real_path == item_path or not os.path.exists(real_path):
-                        print(f"Skipping broken/invalid symlink {item} -> {real_path}")
+                    else:
+                        # If symlink points to root or invalid location, skip
+                        if real_path == '/' or real_path == item_path or not os.path.exists(real_path):
+                            print(f"Skipping broken/invalid symlink {item} -> {real_path}")
                         continue
+                elif not entry.is_dir():
+                    continue
                 
                 # Only process actual directories
-                if os.path.isdir(item_path) and item_path not in seen_mountpoints:
+                if item_path not in seen_mountpoints:
                     try:
-                        # Try to get disk usage - but note this may return parent mount size
-                        usage = psutil.disk_usage(item_path)
+                        # Try to get disk usage - but note this may return parent mount size.
+                        # A volume on the same filesystem as /mnt/volumes reports exactly
+                        # the parent's usage, so statvfs only runs for real mounts.
+                        if os.stat(item_path).st_dev == parent_dev:
+                            usage = parent_usage
+                        else:
+                            usage = psutil.disk_usage(item_path)
                         
                         # If the size matches the parent mount exactly, it's likely a subdirectory
                         # not a separate mount. We'll still show it but note it's approximate.
@@ -317,7 +320,7 @@ def system_info():
             'available': format_file_size(memory.available, use_decimal=True),
             'percent': memory.percent
         },
-        'current_time': datetime.now().isoformat()
+        'current_time': current_time
     }
     
     # Update cache
@@ -340,7 +343,13 @@ def start_scan():
         'report_format': data.get('report_format', 'html'),
         'max_depth': data.get('max_depth', 20),
         'num_threads': data.get('threads', 4),
-        'verbose': data.get('verbose', False)
+        'verbose': data.get('verbose', False),
+        # Detection in worker processes keeps the scan's CPU work off this
+        # process's GIL, so API requests are served promptly during a scan
+        'use_processes': bool(data.get('use_processes', False)),
+        # Size statistics cover every file instead of only scan candidates,
+        # at the cost of a stat per file
+        'full_file_stats': bool(data.get('full_file_stats', False))
     }
     
     # Validate scan path
@@ -356,6 +365,7 @@ def start_scan():
     return jsonify(result)
 
 @app.route('/api/scan/status')
+@etagged
 def scan_status_api():
     """Get current scan status with real-time info"""
     global scan_manager
@@ -366,6 +376,38 @@ def scan_status_api():
     return jsonify(status)
 
 
+@app.route('/api/scan/events')
+def scan_events():
+    """Stream scan status as Server-Sent Events
+    
+    Each event carries the same JSON as /api/scan/status. Status is sent
+    every SSE_STATUS_INTERVAL seconds while a scan runs, and immediately
+    when the scan manager publishes a change (stop, completion).
+    """
+    def generate():
+        events = scan_manager.subscribe()
+        try:
+            last_status = None
+            while True:
+                status = scan_manager.get_current_status()
+                if status['is_running'] or status['status'] != last_status:
+                    yield b'data: ' + orjson.dumps(status) + b'\n\n'
+                else:
+                    # SSE comment; writing it lets a dropped client be noticed
+                    yield b': keepalive\n\n'
+                last_status = status['status']
+                
+                try:
+                    events.get(timeout=SSE_STATUS_INTERVAL)
+                except queue.Empty:
+                    pass
+        finally:
+            scan_manager.unsubscribe(events)
+    
+    return app.response_class(generate(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache'})
+
+
 @app.route('/api/scan/stop', methods=['POST'])
 def stop_scan():
     """Stop the currently running scan"""
@@ -382,12 +424,7 @@ def stop_scan():
 @app.route('/api/results')
 def get_results():
     """Get scan results"""
-    return jsonify({
-        'results': scan_status['results'],
-        'total_found': len(scan_status['results']),
-        'scan_time': scan_status['start_time'],
-        'report_path': scan_status.get('report_path', '')
-    })
+    return jsonify(scan_manager.get_results())
 
 @app.route('/api/scan/summary')
 def get_scan_summary():
@@ -462,59 +499,76 @@ def get_scan_summary():
         return jsonify({'error': f'Failed to generate summary: {str(e)}'}), 500
 
 
+# (history version, serialized /api/scan/history body); one tuple so
+# concurrent rebuilds can't pair a body with another request's version
+_history_response_cache = {
+    'entry': None
+}
+
 @app.route('/api/scan/history')
+@etagged
 def scan_history_api():
     """Get scan history"""
     global scan_history
     try:
-        scans = scan_history.get_all_scans()
-        return jsonify({
-            'scans': [
-                {
-                    'scan_id': scan.scan_id,
-                    'timestamp': scan.timestamp,
-                    'drive_name': scan.drive_name,
-                    'scan_path': scan.scan_path,
-                    'files_found': scan.files_found,
-                    'total_files_scanned': scan.total_files_scanned,
-                    'scan_duration': scan.scan_duration,
-                    'drive_size': scan.drive_size,
-                    'status': scan.status,
-                    'report_files': scan.report_files
-                }
-                for scan in scans
-            ],
-            'total_scans': len(scans)
-        })
+        # The body is rebuilt only when the history has changed since the
+        # last request; scan_history.version is bumped on every save
+        version = scan_history.version
+        entry = _history_response_cache['entry']
+        if entry is None or entry[0] != version:
+            scans = scan_history.get_all_scans()
+            # ScanRecord fields are exactly the API keys; orjson encodes the
+            # dataclasses directly without building a dict per scan
+            body = orjson.dumps({
+                'scans': scans,
+                'total_scans': len(scans)
+            })
+            # Stamped with the version read before building, so a save that
+            # lands meanwhile makes the next request rebuild
+            entry = _history_response_cache['entry'] = (version, body)
+        return app.response_class(entry[1], mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/scan/<scan_id>')
+@etagged
 def get_scan_report(scan_id):
     """Get specific scan report"""
     global scan_history
     try:
-        scan_record = scan_history.get_scan(scan_id)
-        if not scan_record:
+        # Encoded record bytes are cached by the history until it changes
+        scan_json = scan_history.get_scan_json(scan_id)
+        if scan_json is None:
             return jsonify({'error': 'Scan not found'}), 404
             
-        return jsonify({
-            'scan_id': scan_record.scan_id,
-            'timestamp': scan_record.timestamp,
-            'drive_name': scan_record.drive_name,
-            'scan_path': scan_record.scan_path,
-            'files_found': scan_record.files_found,
-            'total_files_scanned': scan_record.total_files_scanned,
-            'scan_duration': scan_record.scan_duration,
-            'drive_size': scan_record.drive_size,
-            'status': scan_record.status,
-            'report_files': scan_record.report_files
-        })
+        return app.response_class(scan_json, mimetype='application/json')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _count_files(path: str, limit: int) -> int:
+    """Count files under path, as os.walk would, stopping once past limit"""
+    file_count = 0
+    pending = deque([path])
+    while pending:
+        try:
+            with os.scandir(pending.popleft()) as it:
+                for entry in it:
+                    # Types come from readdir's d_type; like os.walk, symlinked
+                    # directories are not files but are not descended into
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+                    else:
+                        file_count += 1
+                        if file_count > limit:
+                            return file_count
+        except OSError:
+            # Unreadable subtrees are skipped, as os.walk does
+            continue
+    return file_count
+
 @app.route('/api/browse')
 def browse_files():
     """Browse directory structure"""
@@ -525,27 +579,24 @@ def browse_files():
     
     try:
         items = []
-        for item in sorted(os.listdir(path)):
-            item_path = os.path.join(path, item)
-            if os.path.isdir(item_path):
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            if entry.is_dir():
                 try:
                     # Count files in directory (limit for performance)
-                    file_count = 0
-                    for _, _, files in os.walk(item_path):
-                        file_count += len(files)
-                        if file_count > 1000:  # Limit counting
-                            break
+                    file_count = _count_files(entry.path, BROWSE_FILE_COUNT_LIMIT)
                     
                     items.append({
-                        'name': item,
-                        'path': item_path,
+                        'name': entry.name,
+                        'path': entry.path,
                         'type': 'directory',
                         'file_count': file_count
                     })
                 except PermissionError:
                     items.append({
-                        'name': item,
-                        'path': item_path,
+                        'name': entry.name,
+                        'path': entry.path,
                         'type': 'directory',
                         'file_count': 'N/A'
                     })
@@ -558,17 +609,53 @@ def browse_files():
     except PermissionError:
         return jsonify({'error': 'Permission denied'}), 403
 
+# (history version, report file name -> path for every report in the scan
+# history)
+_report_index_cache = {
+    'entry': None
+}
+
+def _report_index():
+    """Known report files by name, rebuilt only when the scan history changes"""
+    # Read before building, so a save that lands mid-build leaves the index
+    # stale (rebuilt next time) rather than missing a report yet current
+    version = scan_history.version
+    entry = _report_index_cache['entry']
+    if entry is None or entry[0] != version:
+        # Oldest first, so a newer report wins a (same-second) name clash
+        index = {
+            os.path.basename(path): path
+            for scan in reversed(scan_history.get_all_scans())
+            for path in scan.report_files.values() if path
+        }
+        entry = _report_index_cache['entry'] = (version, index)
+    return entry[1]
+
 @app.route('/reports/<path:filename>')
 def serve_report(filename):
     """Serve generated reports"""
-    reports_dir = Path('/app/data/sawdisk_reports')
-    report_path = reports_dir / filename
-    
-    if report_path.exists():
-        from flask import send_file
-        return send_file(report_path)
+    # Reports written by scans live in their scan's directory; look the name
+    # up there first, then in the shared reports directory
+    report_path = _report_index().get(filename)
+    if report_path:
+        directory, filename = os.path.split(report_path)
     else:
+        directory = '/app/data/sawdisk_reports'
+    
+    try:
+        # send_from_directory rejects names that resolve outside directory
+        # (../ traversal) and anything that is not a regular file.
+        # Reports are never rewritten once generated, so browsers may keep
+        # them; revalidations get a 304 from the file's mtime and ETag
+        # without it being read.
+        response = send_from_directory(directory, filename, conditional=True,
+                                       etag=True, max_age=REPORT_MAX_AGE)
+    except NotFound:
         return jsonify({'error': 'Report not found'}), 404
+    
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 if __name__ == '__main__':
     # Create necessary directories